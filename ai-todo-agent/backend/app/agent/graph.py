@@ -2,10 +2,11 @@ from typing import Annotated
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage
 from app.agent.tools import get_user_tools
+from app.agent.utils import execute_tool_calls
 import os
 from dotenv import load_dotenv
 
@@ -14,8 +15,9 @@ load_dotenv()
 class AgentState(TypedDict):
     messages: Annotated[list, add_messages]
 
-def create_user_graph(user_id: int):
-    user_tools = get_user_tools(user_id)
+def create_user_graph(user_id: int, snapshot=None):
+    # 'snapshot' is an optional TodoSnapshot shared with the tools for this session
+    user_tools = get_user_tools(user_id, snapshot)
 
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
@@ -35,22 +37,36 @@ def create_user_graph(user_id: int):
     
     CRITICAL RULES:
     1. When the user asks to Update or Delete a task by NAME (e.g., "Delete the milk task") or by NUMBER (e.g., "Delete task #1"):
-       - First, CALL 'read_todos' to see the list.
+       - First, look for the task in the CURRENT TASKS section below.
+       - If it is not there (or the list says older tasks are not shown), CALL 'read_todos' to see the full list.
        - Look for the task that matches the name or the visual number (#1, #2).
        - Find the 'Real ID' associated with it.
        - ONLY then call 'delete_todo' or 'update_todo' using that Real ID.
        
-    2. Never guess the ID. Always read the list first.
+    2. Never guess the ID. Only use IDs from CURRENT TASKS or from 'read_todos'.
+    3. CURRENT TASKS only lists PENDING tasks, as loaded when this chat started plus the changes made in this chat.
+       Changes made elsewhere (other tabs, file imports) are NOT in it.
+       For completed tasks, or questions about the whole list (e.g. "how many tasks do I have?"), CALL 'read_todos'.
     """
 
     def chatbot(state: AgentState):
         # We prepend the system message to the history so the AI sees it first
-        messages = [SystemMessage(content=system_prompt)] + state["messages"]
+        # The snapshot is rendered on every hop so it reflects tools that just ran
+        context = system_prompt
+        if snapshot is not None:
+            context += "\n\nCURRENT TASKS:\n" + snapshot.render()
+        messages = [SystemMessage(content=context)] + state["messages"]
         return {"messages": [llm_with_tools.invoke(messages)]}
 
+    async def run_tools(state: AgentState):
+        # Independent tool calls from the same AI message run concurrently;
+        # mutations on the same todo ID still run one after another.
+        tool_calls = state["messages"][-1].tool_calls
+        return {"messages": await execute_tool_calls(user_tools, tool_calls)}
+
     workflow = StateGraph(AgentState)
     workflow.add_node("agent", chatbot)
-    workflow.add_node("tools", ToolNode(user_tools)) 
+    workflow.add_node("tools", run_tools)
     workflow.add_edge(START, "agent") 
     workflow.add_conditional_edges("agent", tools_condition)
     workflow.add_edge("tools", "agent")
@@ -0,0 +1,98 @@
+import os
+import threading
+from sqlalchemy.orm import Session
+from app.models import Todo
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 1. CONFIGURATION
+# Rough upper bound for how much of the system prompt the snapshot may take.
+SNAPSHOT_TOKEN_BUDGET = int(os.getenv("SNAPSHOT_TOKEN_BUDGET", "400"))
+# Titles longer than this are cut, the model only needs enough to recognise the task.
+SNAPSHOT_TITLE_CHARS = 40
+# Cheap token estimate (about 4 characters per token), good enough for a budget.
+CHARS_PER_TOKEN = 4
+
+
+class TodoSnapshot:
+    """
+    A compact, per-session copy of the user's PENDING todos (ID, short title).
+    Loaded once when the WebSocket connects and kept in sync by this session's
+    tools, so the agent can pick IDs without calling 'read_todos' first.
+    Completed tasks are never part of it.
+    """
+
+    def __init__(self, token_budget: int = SNAPSHOT_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self._items = {}
+        # Tools run on a worker pool, so updates can arrive from several threads.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db: Session, user_id: int, token_budget: int = SNAPSHOT_TOKEN_BUDGET):
+        """Builds the snapshot from the user's pending todos."""
+        snapshot = cls(token_budget=token_budget)
+        rows = (
+            db.query(Todo.id, Todo.title)
+            .filter(Todo.owner_id == user_id, Todo.is_completed == False)
+            .order_by(Todo.id)
+            .all()
+        )
+        for todo_id, title in rows:
+            snapshot.upsert(todo_id, title)
+        return snapshot
+
+    # --- Updates (called by the tools after a successful commit) ---
+
+    def upsert(self, todo_id: int, title: str):
+        """Adds or updates a pending task."""
+        with self._lock:
+            self._items[todo_id] = self._shorten(title or "")
+
+    def remove(self, todo_id: int):
+        with self._lock:
+            self._items.pop(todo_id, None)
+
+    # --- Rendering ---
+
+    def render(self):
+        """
+        Returns the snapshot as prompt text. If the full list does not fit
+        in the token budget, it degrades to a summary with the newest tasks.
+        """
+        with self._lock:
+            items = sorted(self._items.items())
+
+        if not items:
+            return "Pending tasks (0): none."
+
+        lines = [f"ID {todo_id}: {title}" for todo_id, title in items]
+        header = f"Pending tasks ({len(items)}):"
+
+        if self._tokens(header, *lines) <= self.token_budget:
+            return "\n".join([header] + lines)
+
+        # Too big: keep the most recent tasks that fit and summarise the rest.
+        kept = []
+        for line in reversed(lines):
+            footer = f"... and {len(lines) - len(kept) - 1} older pending tasks not shown. Call 'read_todos' for the full list."
+            if self._tokens(header, line, footer, *kept) > self.token_budget:
+                break
+            kept.insert(0, line)
+
+        footer = f"... and {len(lines) - len(kept)} older pending tasks not shown. Call 'read_todos' for the full list."
+        return "\n".join([header] + kept + [footer])
+
+    # --- Helper Functions ---
+
+    @staticmethod
+    def _shorten(title: str):
+        title = " ".join(title.split())
+        if len(title) <= SNAPSHOT_TITLE_CHARS:
+            return title
+        return title[: SNAPSHOT_TITLE_CHARS - 1] + "…"
+
+    @staticmethod
+    def _tokens(*parts: str):
+        return sum(len(part) + 1 for part in parts) // CHARS_PER_TOKEN
@@ -1,9 +1,9 @@
 from typing import List, Optional, Type
-from langchain.tools import BaseTool, tool
 from pydantic import BaseModel, Field
 from app.database import SessionLocal
 from app.models import Todo
 from app.rag import query_rag # Import the function we just wrote
+from app.agent.utils import make_async_tool
 
 # --- Tool Input Schemas ---
 
@@ -28,12 +28,12 @@ class SearchDocumentInput(BaseModel):
 
 # --- Tool Generator ---
 
-def get_user_tools(user_id: int):
+def get_user_tools(user_id: int, snapshot=None):
+    # 'snapshot' is the session's TodoSnapshot (optional); tools keep it in sync after each commit.
     
     def get_db():
         return SessionLocal()
 
-    @tool("create_todo", args_schema=CreateTodoInput)
     def create_todo(title: str, description: Optional[str] = None):
         """Use this to add a new task to the user's list."""
         print(f"🛠️ TOOL CALL: Create '{title}'") # Debug Print
@@ -43,13 +43,14 @@ def get_user_tools(user_id: int):
             db.add(new_todo)
             db.commit()
             db.refresh(new_todo)
+            if snapshot is not None:
+                snapshot.upsert(new_todo.id, new_todo.title)
             return f"Success: Created task '{title}' with ID {new_todo.id}"
         except Exception as e:
             return f"Error: {str(e)}"
         finally:
             db.close()
 
-    @tool("read_todos")
     def read_todos():
         """Use this to see all current tasks for the user."""
         print(f"🛠️ TOOL CALL: Read List") # Debug Print
@@ -67,7 +68,6 @@ def get_user_tools(user_id: int):
         finally:
             db.close()
 
-    @tool("update_todo", args_schema=UpdateTodoInput)
     def update_todo(todo_id: int, title: str = None, description: str = None, is_completed: bool = None):
         """Use this to modify an existing task."""
         print(f"🛠️ TOOL CALL: Update ID {todo_id}") # Debug Print
@@ -83,6 +83,12 @@ def get_user_tools(user_id: int):
             if is_completed is not None: todo.is_completed = is_completed
             
             db.commit()
+            if snapshot is not None:
+                # The snapshot only holds pending tasks
+                if todo.is_completed:
+                    snapshot.remove(todo.id)
+                else:
+                    snapshot.upsert(todo.id, todo.title)
             return f"Success: Updated task ID {todo_id}"
         except Exception as e:
             print(f"❌ Update Error: {e}")
@@ -90,7 +96,6 @@ def get_user_tools(user_id: int):
         finally:
             db.close()
 
-    @tool("delete_todo", args_schema=DeleteTodoInput)
     def delete_todo(todo_id: int):
         """Use this to permanently remove a task."""
         print(f"🛠️ TOOL CALL: Delete ID {todo_id}") # Debug Print
@@ -103,6 +108,8 @@ def get_user_tools(user_id: int):
             
             db.delete(todo)
             db.commit()
+            if snapshot is not None:
+                snapshot.remove(todo_id)
             return f"Success: Deleted task ID {todo_id}"
         except Exception as e:
             print(f"❌ Delete Error: {e}")
@@ -110,11 +117,18 @@ def get_user_tools(user_id: int):
         finally:
             db.close()
 
-    @tool("search_document", args_schema=SearchDocumentInput)
     def search_document(question: str):
         """Use this tool to answer questions based on the uploaded document."""
         print(f"🔍 RAG SEARCH: {question}")
         context = query_rag(question)
         return f"Relevant info from document:\n{context}"
 
-    return [create_todo, read_todos, update_todo, delete_todo, search_document]
\ No newline at end of file
+    # Every tool gets an async entry point so the agent can run
+    # independent calls from the same step side by side.
+    return [
+        make_async_tool(create_todo, "create_todo", CreateTodoInput),
+        make_async_tool(read_todos, "read_todos"),
+        make_async_tool(update_todo, "update_todo", UpdateTodoInput),
+        make_async_tool(delete_todo, "delete_todo", DeleteTodoInput),
+        make_async_tool(search_document, "search_document", SearchDocumentInput),
+    ]
\ No newline at end of file
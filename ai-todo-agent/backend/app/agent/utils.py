@@ -0,0 +1,95 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Optional, Type
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import StructuredTool
+from pydantic import BaseModel
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 1. CONFIGURATION
+# How many tool calls from a single agent step may run at the same time.
+TOOL_MAX_CONCURRENCY = int(os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+# Threads shared by every connected user. Sized like Python's default executor,
+# so a few slow 'search_document' calls can't stall everyone else's tools.
+TOOL_POOL_WORKERS = int(os.getenv("TOOL_POOL_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+
+# Tools that change a specific todo. Two of these pointing at the same
+# 'todo_id' must never race, so they are chained in the order Gemini sent them.
+MUTATING_TOOLS = {"update_todo", "delete_todo"}
+
+# 2. SHARED WORKER POOL
+# Our DB sessions and Chroma are blocking, so tools run their work here
+# instead of on the event loop. The per-step limit is the semaphore in
+# 'execute_tool_calls', not the size of this pool.
+_tool_pool = ThreadPoolExecutor(max_workers=TOOL_POOL_WORKERS, thread_name_prefix="agent-tool")
+
+# --- Helper Functions ---
+
+async def run_blocking(func: Callable, *args, **kwargs):
+    """Runs a blocking function on the tool pool without freezing the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_tool_pool, partial(func, *args, **kwargs))
+
+def make_async_tool(func: Callable, name: str, args_schema: Optional[Type[BaseModel]] = None):
+    """
+    Wraps a plain function as a LangChain tool with both a sync and an async entry point.
+    The sync path keeps '.invoke()' working; the async path is what the agent uses.
+    """
+    async def coroutine(**kwargs):
+        return await run_blocking(func, **kwargs)
+
+    return StructuredTool.from_function(
+        func=func,
+        coroutine=coroutine,
+        name=name,
+        description=func.__doc__,
+        args_schema=args_schema,
+    )
+
+def group_tool_calls(tool_calls: List[dict]):
+    """
+    Splits the tool calls of one AI message into independent chains.
+    Mutations on the same todo ID share a chain (kept in message order),
+    everything else gets a chain of its own and can run in parallel.
+    """
+    chains = {}
+    for index, call in enumerate(tool_calls):
+        todo_id = call.get("args", {}).get("todo_id") if call["name"] in MUTATING_TOOLS else None
+        key = ("todo", str(todo_id)) if todo_id is not None else ("call", index)
+        chains.setdefault(key, []).append((index, call))
+    return list(chains.values())
+
+# --- Tool Executor ---
+
+async def execute_tool_calls(tools: list, tool_calls: List[dict], max_concurrency: int = TOOL_MAX_CONCURRENCY):
+    """
+    Runs every tool call from one agent step and returns the ToolMessages
+    in the same order as the calls, so the LLM sees a stable history.
+    """
+    tools_by_name = {t.name: t for t in tools}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = [None] * len(tool_calls)
+
+    async def run_one(index: int, call: dict):
+        tool = tools_by_name.get(call["name"])
+        if tool is None:
+            content = f"Error: '{call['name']}' is not a valid tool."
+        else:
+            try:
+                content = await tool.ainvoke(call.get("args", {}))
+            except Exception as e:
+                print(f"❌ Tool Error ({call['name']}): {e}")
+                content = f"Error: {str(e)}"
+        results[index] = ToolMessage(content=str(content), name=call["name"], tool_call_id=call["id"])
+
+    async def run_chain(chain: list):
+        async with semaphore:
+            for index, call in chain:
+                await run_one(index, call)
+
+    await asyncio.gather(*(run_chain(chain) for chain in group_tool_calls(tool_calls)))
+    return results
@@ -1,11 +1,13 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt 
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from . import schemas, models, database
+from . import schemas, models, database, hashing
 import os
 from dotenv import load_dotenv
 
@@ -15,10 +17,13 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "super_secret_key_if_none_set")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+# Revoked refresh tokens are kept this long, so re-use of a stolen one is still detected
+REVOKED_TOKEN_RETENTION_DAYS = int(os.getenv("REVOKED_TOKEN_RETENTION_DAYS", "2"))
 
 # 2. PASSWORD HASHING
-# This helper handles encrypting passwords so we never store them as plain text.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Passwords are never stored as plain text. The bcrypt work runs in a
+# separate process pool (see hashing.py), so these helpers are async.
 
 # 3. TOKEN AUTH SCHEME
 # This tells FastAPI that the client should send the token in the "Authorization" header
@@ -26,13 +31,13 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # --- Helper Functions ---
 
-def verify_password(plain_password, hashed_password):
+async def verify_password(plain_password, hashed_password):
     """Checks if the typed password matches the stored hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await hashing.verify_password(plain_password, hashed_password)
 
-def get_password_hash(password):
+async def get_password_hash(password):
     """Converts a plain password into a secure hash."""
-    return pwd_context.hash(password)
+    return await hashing.hash_password(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Generates a JWT token that expires after a set time."""
@@ -46,6 +51,100 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# --- Refresh Tokens ---
+# Refresh tokens are long random strings, so a fast SHA-256 is enough to store
+# them safely. Renewing a session therefore never touches bcrypt.
+
+def hash_refresh_token(token: str):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def prune_refresh_tokens(db: Session, user_id: int):
+    """
+    Deletes the user's expired tokens and tokens revoked long ago.
+    Recently revoked ones stay, so reuse detection keeps working.
+    Does not commit; the caller does.
+    """
+    now = datetime.utcnow()
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.user_id == user_id,
+        or_(
+            models.RefreshToken.expires_at < now,
+            models.RefreshToken.revoked_at < now - timedelta(days=REVOKED_TOKEN_RETENTION_DAYS),
+        ),
+    ).delete(synchronize_session=False)
+
+def create_refresh_token(db: Session, user_id: int):
+    """Creates a new refresh token for the user. Only its hash is stored."""
+    token = secrets.token_urlsafe(32)
+    # Every login and refresh adds a row, so clean up old ones as we go
+    prune_refresh_tokens(db, user_id)
+    db.add(models.RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    db.commit()
+    return token
+
+def revoke_all_refresh_tokens(db: Session, user_id: int):
+    """Revokes every active refresh token of the user."""
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.user_id == user_id,
+        models.RefreshToken.revoked_at.is_(None),
+    ).update({models.RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+def rotate_refresh_token(db: Session, token: str):
+    """
+    Exchanges a refresh token for a new one (the old one is revoked).
+    If an already-used token shows up again, it was probably stolen,
+    so every session of that user is revoked.
+    Returns (user, new_refresh_token).
+    """
+    invalid_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    record = db.query(models.RefreshToken).filter(
+        models.RefreshToken.token_hash == hash_refresh_token(token)
+    ).first()
+    if record is None:
+        raise invalid_exception
+
+    user_id = record.user_id
+    if record.revoked_at is not None:
+        revoke_all_refresh_tokens(db, user_id)
+        raise invalid_exception
+    if record.expires_at < datetime.utcnow():
+        raise invalid_exception
+
+    # Conditional update, so two requests racing with the same token can't both win
+    revoked = db.query(models.RefreshToken).filter(
+        models.RefreshToken.id == record.id,
+        models.RefreshToken.revoked_at.is_(None),
+    ).update({models.RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+    if revoked == 0:
+        db.rollback()
+        revoke_all_refresh_tokens(db, user_id)
+        raise invalid_exception
+
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if user is None:
+        db.rollback()
+        raise invalid_exception
+
+    new_token = create_refresh_token(db, user_id)
+    return user, new_token
+
+def revoke_refresh_token(db: Session, token: str):
+    """Revokes a single refresh token (used on logout)."""
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.token_hash == hash_refresh_token(token),
+        models.RefreshToken.revoked_at.is_(None),
+    ).update({models.RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
 # --- Dependency: Get Current User ---
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
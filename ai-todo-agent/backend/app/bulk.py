@@ -0,0 +1,193 @@
+import csv
+import io
+import json
+import os
+from typing import Callable, Iterable, Iterator
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from . import schemas
+from .models import Todo
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 1. CONFIGURATION
+# Rows per INSERT/COPY statement on import, and rows per chunk on export.
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+EXPORT_FIELDS = ["id", "title", "description", "is_completed", "created_at"]
+# Only these columns are imported. IDs and owners always come from our side.
+IMPORT_FIELDS = ["title", "description", "is_completed"]
+
+# ==========================================
+# EXPORT
+# ==========================================
+
+def iter_export(session_factory: Callable[[], Session], user_id: int, fmt: str = "ndjson") -> Iterator[str]:
+    """
+    Streams the user's todos as NDJSON or CSV text chunks.
+    Rows are read through a server-side cursor (yield_per), so memory
+    stays constant no matter how many todos the user has.
+    The generator owns its DB session because it outlives the request handler.
+    """
+    db = session_factory()
+    try:
+        query = (
+            db.query(Todo.id, Todo.title, Todo.description, Todo.is_completed, Todo.created_at)
+            .filter(Todo.owner_id == user_id)
+            .order_by(Todo.id)
+            .yield_per(BULK_BATCH_SIZE)
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_FIELDS)
+
+        count = 0
+        for row in query:
+            values = dict(zip(EXPORT_FIELDS, row))
+            values["created_at"] = values["created_at"].isoformat() if values["created_at"] else None
+            if writer:
+                writer.writerow([values[field] for field in EXPORT_FIELDS])
+            else:
+                buffer.write(json.dumps(values) + "\n")
+
+            count += 1
+            if count % BULK_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+# ==========================================
+# IMPORT
+# ==========================================
+
+def iter_rows(text_file: Iterable[str], fmt: str = "ndjson") -> Iterator[dict]:
+    """Parses an NDJSON or CSV file one row at a time."""
+    if fmt == "csv":
+        yield from csv.DictReader(text_file)
+        return
+
+    for line in text_file:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            # Hand it on as a bad row, so it gets counted as skipped
+            yield {}
+
+def _to_values(raw: dict, user_id: int):
+    """Validates one imported row. Returns None if the row is invalid."""
+    if not isinstance(raw, dict):
+        return None
+    # CSV has no null, so empty cells mean "not set"
+    data = {field: raw.get(field) for field in IMPORT_FIELDS if raw.get(field) not in (None, "")}
+    try:
+        todo = schemas.TodoCreate(**data)
+    except ValidationError:
+        return None
+    return {
+        "title": todo.title,
+        "description": todo.description,
+        "is_completed": bool(todo.is_completed),
+        "owner_id": user_id,
+    }
+
+def _insert_batch(db: Session, batch: list):
+    """
+    Writes one batch. On PostgreSQL (psycopg2) we use COPY, which is the
+    fastest way in. Everywhere else it's a single multi-row INSERT.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        cursor = db.connection().connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for values in batch:
+                    # Unquoted empty field = NULL in COPY's CSV format
+                    writer.writerow([values["title"], values["description"], "t" if values["is_completed"] else "f", values["owner_id"]])
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {Todo.__tablename__} (title, description, is_completed, owner_id) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+                return
+        finally:
+            cursor.close()
+
+    db.execute(insert(Todo).values(batch))
+
+def import_todos(db: Session, user_id: int, rows: Iterable[dict], batch_size: int = BULK_BATCH_SIZE) -> Iterator[dict]:
+    """
+    Inserts rows for the user in batches and yields a progress report after
+    each committed batch. Invalid rows are skipped and counted.
+    Batches already committed stay in place if a later one fails.
+    """
+    imported = 0
+    skipped = 0
+    batch = []
+
+    for raw in rows:
+        values = _to_values(raw, user_id)
+        if values is None:
+            skipped += 1
+            continue
+        batch.append(values)
+
+        if len(batch) >= batch_size:
+            _insert_batch(db, batch)
+            db.commit()
+            imported += len(batch)
+            batch = []
+            yield {"status": "progress", "imported": imported, "skipped": skipped}
+
+    if batch:
+        _insert_batch(db, batch)
+        db.commit()
+        imported += len(batch)
+
+    yield {"status": "done", "imported": imported, "skipped": skipped}
+
+def remove_file(file_path: str):
+    """Deletes an import file; safe to call more than once."""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+def iter_import(session_factory: Callable[[], Session], user_id: int, file_path: str, fmt: str = "ndjson") -> Iterator[str]:
+    """
+    Streams an import from a file on disk and reports progress as NDJSON lines.
+    The file is deleted when the import finishes. If the generator never runs
+    (client gone before streaming starts), the caller must delete it.
+    """
+    db = session_factory()
+    imported = 0
+    try:
+        # utf-8-sig: Excel's "CSV UTF-8" starts with a BOM that would end up in the first header
+        with open(file_path, "r", encoding="utf-8-sig", newline="") as text_file:
+            for report in import_todos(db, user_id, iter_rows(text_file, fmt)):
+                imported = report["imported"]
+                yield json.dumps(report) + "\n"
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Import Error: {e}")
+        yield json.dumps({"status": "error", "imported": imported, "detail": str(e)}) + "\n"
+    finally:
+        db.close()
+        remove_file(file_path)
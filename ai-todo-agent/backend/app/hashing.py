@@ -0,0 +1,64 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from passlib.context import CryptContext
+from dotenv import load_dotenv
+
+# NOTE: The workers are started with "spawn", so they import only this
+# module. It must stay light (no database, no AI imports).
+
+load_dotenv()
+
+# 1. CONFIGURATION
+# bcrypt cost factor. Every +1 doubles the CPU time of a login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Number of processes doing bcrypt work. Keeps hashing off the request threads
+# and caps how many cores logins can take away from chat streaming.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
+
+# 2. PASSWORD HASHING
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# 3. WORKER POOL
+# Created lazily on first use, so importing the app doesn't spawn processes.
+# "spawn" instead of Linux's default "fork": by the first login the server already
+# runs threads and holds DB connections, and forking that can deadlock or leak sockets.
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def shutdown():
+    """Stops the worker processes (called when the server shuts down)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+# --- Worker Functions (run inside the pool) ---
+
+def _hash(password: str):
+    return pwd_context.hash(password)
+
+def _verify(plain_password: str, hashed_password: str):
+    return pwd_context.verify(plain_password, hashed_password)
+
+# --- Public Helpers ---
+
+# These are awaited, so no request thread sits idle while bcrypt runs.
+
+async def hash_password(password: str):
+    """Hashes a password on the worker pool."""
+    return await asyncio.wrap_future(_get_pool().submit(_hash, password))
+
+async def verify_password(plain_password: str, hashed_password: str):
+    """Checks a password against its hash on the worker pool."""
+    return await asyncio.wrap_future(_get_pool().submit(_verify, plain_password, hashed_password))
@@ -17,6 +17,9 @@ class User(Base):
     # Relationship: A user can have multiple todo items
     todos = relationship("Todo", back_populates="owner")
 
+    # Relationship: A user can have several active sessions (refresh tokens)
+    refresh_tokens = relationship("RefreshToken", back_populates="user")
+
 class Todo(Base):
     """
     SQLAlchemy Model for the 'todos' table.
@@ -34,4 +37,24 @@ class Todo(Base):
     owner_id = Column(Integer, ForeignKey("users.id"))
 
     # Relationship: A todo belongs to one user
-    owner = relationship("User", back_populates="todos")
\ No newline at end of file
+    owner = relationship("User", back_populates="todos")
+
+class RefreshToken(Base):
+    """
+    SQLAlchemy Model for the 'refresh_tokens' table.
+    Stores a SHA-256 hash of each refresh token, never the token itself.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    token_hash = Column(String, unique=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime)
+    # Set when the token is rotated or the user logs out
+    revoked_at = Column(DateTime, nullable=True)
+
+    # Link the token to a specific User ID (Foreign Key)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+
+    # Relationship: A refresh token belongs to one user
+    user = relationship("User", back_populates="refresh_tokens")
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Bulk import/export benchmark.
+
+Generates an NDJSON file, imports it for a throwaway user, exports it again
+and prints rows/sec plus peak memory. Runs against DATABASE_URL from .env
+(on PostgreSQL the import goes through COPY).
+
+Usage (from the backend folder):
+    python benchmarks/bulk_transfer.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import bulk, database, models
+
+def peak_memory_mb():
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk import/export.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of todos")
+    parser.add_argument("--format", choices=list(bulk.FORMATS), default="ndjson")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    user = models.User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    # 1. Generate the input file
+    with tempfile.NamedTemporaryFile("w", delete=False, suffix=f".{args.format}") as source:
+        if args.format == "csv":
+            source.write("title,description,is_completed\n")
+            for i in range(args.rows):
+                source.write(f"Task {i},Generated by benchmark,{i % 2 == 0}\n")
+        else:
+            for i in range(args.rows):
+                source.write(json.dumps({"title": f"Task {i}", "description": "Generated by benchmark", "is_completed": i % 2 == 0}) + "\n")
+    print(f"rows:                 {args.rows:,} ({args.format}, dialect: {database.engine.dialect.name})")
+    print(f"memory after setup:   {peak_memory_mb():,.1f} MB")
+
+    try:
+        # 2. Import (iter_import deletes the file when it's done)
+        start = time.perf_counter()
+        for line in bulk.iter_import(database.SessionLocal, user_id, source.name, args.format):
+            report = json.loads(line)
+        elapsed = time.perf_counter() - start
+        print(f"import:               {report['imported']:,} rows in {elapsed:.1f}s ({report['imported'] / elapsed:,.0f} rows/sec)")
+        print(f"peak memory:          {peak_memory_mb():,.1f} MB")
+
+        # 3. Export
+        start = time.perf_counter()
+        exported_bytes = 0
+        for chunk in bulk.iter_export(database.SessionLocal, user_id, args.format):
+            exported_bytes += len(chunk)
+        elapsed = time.perf_counter() - start
+        # The throwaway user owns exactly the imported rows, so that's what was exported
+        exported_rows = report["imported"]
+        print(f"export:               {exported_rows:,} rows, {exported_bytes / 1024 / 1024:,.1f} MB in {elapsed:.1f}s ({exported_rows / elapsed:,.0f} rows/sec)")
+        print(f"peak memory:          {peak_memory_mb():,.1f} MB")
+    finally:
+        # 4. Cleanup
+        db.query(models.Todo).filter(models.Todo.owner_id == user_id).delete(synchronize_session=False)
+        db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    main()
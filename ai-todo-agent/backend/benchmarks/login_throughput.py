@@ -0,0 +1,66 @@
+"""
+Login throughput benchmark.
+
+Measures how many password checks per second the bcrypt worker pool can do,
+per core, and compares it with renewing a session through a refresh token.
+
+Usage (from the backend folder):
+    python benchmarks/login_throughput.py --rounds 12 --workers 2 --logins 200
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput.")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="hashing processes")
+    parser.add_argument("--logins", type=int, default=200, help="number of password checks")
+    args = parser.parse_args()
+
+    # The pool reads its settings from the environment on import
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["HASH_WORKERS"] = str(args.workers)
+    from app import hashing
+
+    password = "correct horse battery staple"
+    hashed = hashing.pwd_context.hash(password)
+
+    # 1. Inline (what /token used to do on the request thread)
+    inline_logins = max(1, args.logins // 10)
+    start = time.perf_counter()
+    for _ in range(inline_logins):
+        hashing.pwd_context.verify(password, hashed)
+    inline_rate = inline_logins / (time.perf_counter() - start)
+
+    # 2. Worker pool, driven by many concurrent requests (like the async /token handler)
+    async def run_logins(count):
+        await asyncio.gather(*(hashing.verify_password(password, hashed) for _ in range(count)))
+
+    asyncio.run(run_logins(args.workers)) # warm up the processes
+    start = time.perf_counter()
+    asyncio.run(run_logins(args.logins))
+    pool_rate = args.logins / (time.perf_counter() - start)
+    hashing.shutdown()
+
+    # 3. Refresh token renewal: same SHA-256 as auth.hash_refresh_token, no bcrypt.
+    # (Done inline so the benchmark doesn't need DATABASE_URL.)
+    renewals = 100_000
+    start = time.perf_counter()
+    for i in range(renewals):
+        hashlib.sha256(f"token-{i}".encode()).hexdigest()
+    refresh_rate = renewals / (time.perf_counter() - start)
+
+    print(f"bcrypt rounds:            {args.rounds}")
+    print(f"hashing workers:          {args.workers}")
+    print(f"inline logins/sec:        {inline_rate:,.1f} (1 core)")
+    print(f"pool logins/sec:          {pool_rate:,.1f} ({pool_rate / args.workers:,.1f} per core)")
+    print(f"refresh token hashes/sec: {refresh_rate:,.0f} (1 core)")
+
+if __name__ == "__main__":
+    main()
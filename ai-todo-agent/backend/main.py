@@ -1,17 +1,22 @@
 from fastapi import FastAPI, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
 from fastapi import File, UploadFile
 from app.rag import process_document
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import shutil
+import tempfile
 import json
 import os
 
 # Import our internal modules
-from app import models, schemas, auth, database
+from app import models, schemas, auth, database, hashing, bulk
 from app.agent.graph import create_user_graph
+from app.agent.snapshot import TodoSnapshot
 from langchain_core.messages import HumanMessage
 
 # 1. Initialize Database Tables
@@ -20,6 +25,11 @@ models.Base.metadata.create_all(bind=database.engine)
 
 app = FastAPI(title="AI Todo Agent")
 
+@app.on_event("shutdown")
+def shutdown_hashing_pool():
+    # Stop the bcrypt worker processes together with the server
+    hashing.shutdown()
+
 # 2. CORS Setup (Crucial for React)
 # Allows the frontend (running on port 5173) to talk to this backend.
 app.add_middleware(
@@ -46,35 +56,62 @@ def get_db():
 # AUTHENTICATION ENDPOINTS
 # ==========================================
 
+# async handlers: bcrypt runs in the hashing process pool and is awaited,
+# so logins don't hold a threadpool thread while hashing.
+# The DB calls are blocking, so they go through run_in_threadpool
+# to keep them off the event loop (and away from chat streaming).
+
+def find_user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+def save_new_user(db: Session, email: str, hashed_pw: str):
+    new_user = models.User(email=email, hashed_password=hashed_pw)
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    # Load 'todos' here, so building the response doesn't hit the DB on the event loop
+    new_user.todos
+    return new_user
+
 @app.post("/register", response_model=schemas.UserResponse)
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     # Check if email already exists
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+    db_user = await run_in_threadpool(find_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password and save
-    hashed_pw = auth.get_password_hash(user.password)
-    new_user = models.User(email=user.email, hashed_password=hashed_pw)
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    hashed_pw = await auth.get_password_hash(user.password)
+    return await run_in_threadpool(save_new_user, db, user.email, hashed_pw)
 
 @app.post("/token", response_model=schemas.Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     # verify user
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not auth.verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(find_user_by_email, db, form_data.username)
+    if not user or not await auth.verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Generate Token
+    # Generate Tokens (the refresh token lets the client renew without logging in again)
     access_token = auth.create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    refresh_token = await run_in_threadpool(auth.create_refresh_token, db, user.id)
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+@app.post("/token/refresh", response_model=schemas.Token)
+def refresh_access_token(request: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    # Rotate: the old refresh token is revoked and a new pair is issued.
+    # No password check here, so renewing a session costs no bcrypt work.
+    user, refresh_token = auth.rotate_refresh_token(db, request.refresh_token)
+    access_token = auth.create_access_token(data={"sub": user.email})
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+@app.post("/logout")
+def logout(request: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    auth.revoke_refresh_token(db, request.refresh_token)
+    return {"message": "Logged out"}
 
 @app.get("/users/me", response_model=schemas.UserResponse)
 def read_users_me(current_user: models.User = Depends(auth.get_current_user)):
@@ -92,6 +129,45 @@ def get_todos(db: Session = Depends(get_db), current_user: models.User = Depends
     """
     return current_user.todos
 
+@app.get("/todos/export")
+def export_todos(format: str = "ndjson", current_user: models.User = Depends(auth.get_current_user)):
+    """
+    Stream all todos of the logged-in user as NDJSON (default) or CSV.
+    Rows are read with a server-side cursor, so memory use stays flat.
+    """
+    if format not in bulk.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(bulk.FORMATS)}")
+
+    return StreamingResponse(
+        bulk.iter_export(database.SessionLocal, current_user.id, format),
+        media_type=bulk.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format}"'},
+    )
+
+@app.post("/todos/import")
+def import_todos(file: UploadFile = File(...), format: Optional[str] = None, current_user: models.User = Depends(auth.get_current_user)):
+    """
+    Import todos from an NDJSON or CSV file (format is guessed from the file name if not given).
+    Rows are inserted in batches; the response streams one NDJSON progress line per batch.
+    """
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    if format not in bulk.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(bulk.FORMATS)}")
+
+    # Save the upload to our own temp file first (like /upload does),
+    # so the import can keep reading it after this handler returns.
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{format}") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    # The background task deletes the temp file even if the client
+    # disconnects before the import generator ever starts.
+    return StreamingResponse(
+        bulk.iter_import(database.SessionLocal, current_user.id, buffer.name, format),
+        media_type=bulk.FORMATS["ndjson"],
+        background=BackgroundTask(bulk.remove_file, buffer.name),
+    )
+
 @app.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     # Save file temporarily
@@ -135,8 +211,11 @@ async def websocket_endpoint(websocket: WebSocket, token: str = None, db: Sessio
         return
 
     # 2. Initialize AI
+    # Load the user's pending todos once, so the agent doesn't need a
+    # 'read_todos' hop at the start of every turn.
     try:
-        agent_graph = create_user_graph(user.id)
+        snapshot = TodoSnapshot.load(db, user.id)
+        agent_graph = create_user_graph(user.id, snapshot)
     except Exception as e:
         await websocket.send_json({"type": "error", "content": "AI Init Failed"})
         await websocket.close()
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models import User
+
+# 1. Setup a Mock Database (In-Memory SQLite)
+# StaticPool: tools run on worker threads and export/import open their own
+# sessions, so every connection must see the same in-memory DB.
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# 2. Fixture: Create/Destroy DB for each test
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+
+    # CRITICAL FIX: Prevent the tool from closing the session during tests
+    # We overwrite the .close() method to do nothing.
+    session.close = lambda: None
+
+    try:
+        yield session
+    finally:
+        # Restore real close functionality for cleanup
+        del session.close
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+# 3. Fixture: Session factory for code that opens its own sessions
+@pytest.fixture
+def session_factory(db_session):
+    return TestingSessionLocal
+
+# 4. Fixture: Create a Mock User
+@pytest.fixture
+def test_user(db_session):
+    user = User(email="test@test.com", hashed_password="fake_hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from app.models import RefreshToken
+from app import auth, hashing
+
+# --- THE TESTS ---
+
+def test_password_hashing_pool():
+    """Test that hashing in the worker pool round-trips"""
+    hashed = asyncio.run(hashing.hash_password("secret"))
+
+    assert hashed != "secret"
+    assert asyncio.run(hashing.verify_password("secret", hashed))
+    assert not asyncio.run(hashing.verify_password("wrong", hashed))
+
+def test_refresh_token_stored_hashed(db_session, test_user):
+    """Test that the raw refresh token never hits the DB"""
+    token = auth.create_refresh_token(db_session, test_user.id)
+
+    record = db_session.query(RefreshToken).first()
+    assert record.token_hash != token
+    assert record.token_hash == auth.hash_refresh_token(token)
+
+def test_refresh_token_rotation(db_session, test_user):
+    """Test that a refresh token can only be used once"""
+    token = auth.create_refresh_token(db_session, test_user.id)
+
+    user, new_token = auth.rotate_refresh_token(db_session, token)
+    assert user.id == test_user.id
+    assert new_token != token
+
+    # Re-using the old token fails and revokes the whole family
+    with pytest.raises(HTTPException):
+        auth.rotate_refresh_token(db_session, token)
+    with pytest.raises(HTTPException):
+        auth.rotate_refresh_token(db_session, new_token)
+
+def test_refresh_token_revoke_and_expiry(db_session, test_user):
+    """Test that revoked or expired tokens are rejected"""
+    revoked = auth.create_refresh_token(db_session, test_user.id)
+    auth.revoke_refresh_token(db_session, revoked)
+    with pytest.raises(HTTPException):
+        auth.rotate_refresh_token(db_session, revoked)
+
+    expired = auth.create_refresh_token(db_session, test_user.id)
+    record = db_session.query(RefreshToken).filter(
+        RefreshToken.token_hash == auth.hash_refresh_token(expired)
+    ).first()
+    record.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    db_session.commit()
+    with pytest.raises(HTTPException):
+        auth.rotate_refresh_token(db_session, expired)
+
+def test_refresh_tokens_are_pruned(db_session, test_user):
+    """Test that issuing a token removes expired and long-revoked rows"""
+    expired = auth.create_refresh_token(db_session, test_user.id)
+    old_revoked = auth.create_refresh_token(db_session, test_user.id)
+    recent_revoked = auth.create_refresh_token(db_session, test_user.id)
+
+    def record(token):
+        return db_session.query(RefreshToken).filter(
+            RefreshToken.token_hash == auth.hash_refresh_token(token)
+        ).first()
+
+    record(expired).expires_at = datetime.utcnow() - timedelta(minutes=1)
+    record(old_revoked).revoked_at = datetime.utcnow() - timedelta(days=auth.REVOKED_TOKEN_RETENTION_DAYS + 1)
+    record(recent_revoked).revoked_at = datetime.utcnow()
+    db_session.commit()
+
+    auth.create_refresh_token(db_session, test_user.id)
+
+    assert record(expired) is None
+    assert record(old_revoked) is None
+    # Kept, so re-using it still revokes the whole family
+    assert record(recent_revoked) is not None
+    assert db_session.query(RefreshToken).count() == 2
@@ -0,0 +1,72 @@
+import io
+import pytest
+from app.models import User, Todo
+from app import bulk
+
+# --- THE TESTS ---
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_import_round_trip(db_session, session_factory, test_user, fmt):
+    """Test that an export can be imported back as-is"""
+    db_session.add_all([
+        Todo(title="Buy Milk", description="2 litres", owner_id=test_user.id),
+        Todo(title="Walk Dog", is_completed=True, owner_id=test_user.id),
+        Todo(title="Someone else's", owner_id=999),
+    ])
+    db_session.commit()
+
+    exported = "".join(bulk.iter_export(session_factory, test_user.id, fmt))
+    assert "Someone else's" not in exported
+
+    # Import into a second user
+    other = User(email="other@test.com", hashed_password="fake_hash")
+    db_session.add(other)
+    db_session.commit()
+
+    reports = list(bulk.import_todos(db_session, other.id, bulk.iter_rows(io.StringIO(exported, newline=""), fmt)))
+    assert reports[-1] == {"status": "done", "imported": 2, "skipped": 0}
+
+    todos = db_session.query(Todo).filter(Todo.owner_id == other.id).order_by(Todo.id).all()
+    assert [(t.title, t.description, t.is_completed) for t in todos] == [
+        ("Buy Milk", "2 litres", False),
+        ("Walk Dog", None, True),
+    ]
+
+def test_import_reports_progress_per_batch(db_session, test_user):
+    """Test batching, progress reports and skipping of bad rows"""
+    lines = [f'{{"title": "Task {i}"}}' for i in range(5)]
+    lines.insert(2, "not json")
+    lines.insert(4, '{"description": "no title"}')
+
+    reports = list(bulk.import_todos(
+        db_session, test_user.id, bulk.iter_rows(io.StringIO("\n".join(lines)), "ndjson"), batch_size=2
+    ))
+
+    assert [r["imported"] for r in reports] == [2, 4, 5]
+    assert reports[-1]["status"] == "done"
+    assert reports[-1]["skipped"] == 2
+    assert db_session.query(Todo).filter(Todo.owner_id == test_user.id).count() == 5
+
+def test_iter_import_removes_file(session_factory, test_user, tmp_path):
+    """Test that the import file is deleted, and that cleanup is safe to repeat"""
+    path = tmp_path / "todos.ndjson"
+    path.write_text('{"title": "Buy Milk"}\n')
+
+    lines = list(bulk.iter_import(session_factory, test_user.id, str(path), "ndjson"))
+
+    assert '"done"' in lines[-1]
+    assert not path.exists()
+    # The route's background task runs afterwards and must not fail
+    bulk.remove_file(str(path))
+
+def test_iter_import_csv_with_bom(db_session, session_factory, test_user, tmp_path):
+    """Test that a CSV saved by Excel (UTF-8 with BOM) imports correctly"""
+    path = tmp_path / "todos.csv"
+    path.write_bytes("title,description,is_completed\r\nBuy Milk,2 litres,FALSE\r\n".encode("utf-8-sig"))
+
+    lines = list(bulk.iter_import(session_factory, test_user.id, str(path), "csv"))
+
+    assert '"imported": 1' in lines[-1]
+    assert '"skipped": 0' in lines[-1]
+    todo = db_session.query(Todo).filter(Todo.owner_id == test_user.id).first()
+    assert todo.title == "Buy Milk"
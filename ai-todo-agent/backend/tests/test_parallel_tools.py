@@ -0,0 +1,84 @@
+import asyncio
+import time
+from pydantic import BaseModel, Field
+from app.agent.utils import make_async_tool, execute_tool_calls, group_tool_calls
+
+# 1. Fake tools that just block, like a slow DB session or Chroma lookup
+SLOW_SECONDS = 0.2
+
+class SlowInput(BaseModel):
+    label: str = Field(..., description="Anything.")
+
+class UpdateInput(BaseModel):
+    todo_id: int = Field(..., description="Todo ID.")
+    title: str = Field(..., description="New title.")
+
+def make_slow_tool():
+    def slow_tool(label: str):
+        """Sleeps to simulate blocking I/O."""
+        time.sleep(SLOW_SECONDS)
+        return f"done {label}"
+    return make_async_tool(slow_tool, "slow_tool", SlowInput)
+
+def make_call(name, args, index):
+    return {"name": name, "args": args, "id": f"call_{index}"}
+
+# --- THE TESTS ---
+
+def test_parallel_calls_reduce_wall_clock():
+    """Four independent calls should take about one call's time, not four."""
+    tools = [make_slow_tool()]
+    calls = [make_call("slow_tool", {"label": str(i)}, i) for i in range(4)]
+
+    start = time.perf_counter()
+    asyncio.run(execute_tool_calls(tools, calls, max_concurrency=1))
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = asyncio.run(execute_tool_calls(tools, calls, max_concurrency=4))
+    parallel = time.perf_counter() - start
+
+    assert sequential >= 4 * SLOW_SECONDS
+    assert parallel < 2 * SLOW_SECONDS
+    # Results must come back in the same order as the calls
+    assert [r.content for r in results] == ["done 0", "done 1", "done 2", "done 3"]
+    assert [r.tool_call_id for r in results] == ["call_0", "call_1", "call_2", "call_3"]
+
+def test_conflicting_mutations_run_in_order():
+    """Two updates on the same todo ID must not race."""
+    applied = []
+
+    def update_todo(todo_id: int, title: str):
+        """Records the order updates are applied in."""
+        # The first call sleeps longer, so a race would flip the order
+        time.sleep(SLOW_SECONDS if title == "first" else 0)
+        applied.append((todo_id, title))
+        return f"Success: Updated task ID {todo_id}"
+
+    tools = [make_async_tool(update_todo, "update_todo", UpdateInput)]
+    calls = [
+        make_call("update_todo", {"todo_id": 7, "title": "first"}, 0),
+        make_call("update_todo", {"todo_id": 7, "title": "second"}, 1),
+    ]
+
+    asyncio.run(execute_tool_calls(tools, calls))
+
+    assert applied == [(7, "first"), (7, "second")]
+
+def test_group_tool_calls():
+    """Only mutations on the same ID are chained together."""
+    calls = [
+        make_call("create_todo", {"title": "A"}, 0),
+        make_call("update_todo", {"todo_id": 1, "title": "B"}, 1),
+        make_call("delete_todo", {"todo_id": 1}, 2),
+        make_call("update_todo", {"todo_id": 2, "title": "C"}, 3),
+    ]
+
+    chains = group_tool_calls(calls)
+
+    assert [[index for index, _ in chain] for chain in chains] == [[0], [1, 2], [3]]
+
+def test_unknown_tool_returns_error():
+    calls = [make_call("missing_tool", {}, 0)]
+    results = asyncio.run(execute_tool_calls([], calls))
+    assert "Error" in results[0].content
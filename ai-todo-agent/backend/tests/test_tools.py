@@ -1,46 +1,10 @@
+import asyncio
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from unittest.mock import patch
-from app.database import Base
-from app.models import User, Todo
+from app.models import Todo
 from app.agent.tools import get_user_tools
-
-# 1. Setup a Mock Database (In-Memory SQLite)
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# 2. Fixture: Create/Destroy DB for each test
-@pytest.fixture(scope="function")
-def db_session():
-    Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
-    
-    # CRITICAL FIX: Prevent the tool from closing the session during tests
-    # We overwrite the .close() method to do nothing.
-    session.close = lambda: None
-    
-    try:
-        yield session
-    finally:
-        # Restore real close functionality for cleanup
-        del session.close 
-        session.close()
-        Base.metadata.drop_all(bind=engine)
-
-# 3. Fixture: Create a Mock User
-@pytest.fixture
-def test_user(db_session):
-    user = User(email="test@test.com", hashed_password="fake_hash")
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+from app.agent.snapshot import TodoSnapshot
+from app.agent.utils import execute_tool_calls
 
 # --- THE FIXED TESTS ---
 
@@ -107,3 +71,73 @@ def test_delete_todo_security(db_session, test_user):
         # Verify Task B still exists
         exists = db_session.query(Todo).filter(Todo.id == task_b.id).first()
         assert exists is not None
+
+def test_real_tools_through_executor(db_session, test_user):
+    """Test that the real tools work through the async executor"""
+
+    task = Todo(title="Buy Milk", owner_id=test_user.id)
+    db_session.add(task)
+    db_session.commit()
+    task_id = task.id
+
+    # Same todo ID, so the executor must run update first and delete second
+    calls = [
+        {"name": "update_todo", "args": {"todo_id": task_id, "is_completed": True}, "id": "call_0"},
+        {"name": "delete_todo", "args": {"todo_id": task_id}, "id": "call_1"},
+    ]
+
+    with patch("app.agent.tools.SessionLocal", return_value=db_session):
+        tools = get_user_tools(test_user.id)
+        results = asyncio.run(execute_tool_calls(tools, calls))
+
+    assert results[0].content == f"Success: Updated task ID {task_id}"
+    assert results[1].content == f"Success: Deleted task ID {task_id}"
+    assert db_session.query(Todo).filter(Todo.id == task_id).first() is None
+
+def test_tools_keep_snapshot_in_sync(db_session, test_user):
+    """Test that committed tool calls update the session's todo snapshot"""
+
+    task = Todo(title="Buy Milk", owner_id=test_user.id)
+    done = Todo(title="Old Task", owner_id=test_user.id, is_completed=True)
+    db_session.add_all([task, done])
+    db_session.commit()
+
+    # Only pending tasks are loaded on connect
+    snapshot = TodoSnapshot.load(db_session, test_user.id)
+    assert "Buy Milk" in snapshot.render()
+    assert "Old Task" not in snapshot.render()
+
+    with patch("app.agent.tools.SessionLocal", return_value=db_session):
+        tools = get_user_tools(test_user.id, snapshot)
+        create_tool = next(t for t in tools if t.name == "create_todo")
+        update_tool = next(t for t in tools if t.name == "update_todo")
+        delete_tool = next(t for t in tools if t.name == "delete_todo")
+
+        create_tool.invoke({"title": "Walk Dog"})
+        create_tool.invoke({"title": "Pay Rent"})
+        update_tool.invoke({"todo_id": task.id, "is_completed": True})
+
+        # Completed tasks drop out of the pending-only snapshot
+        rendered = snapshot.render()
+        assert "Pending tasks (2):" in rendered
+        assert "Buy Milk" not in rendered
+
+        delete_tool.invoke({"todo_id": task.id})
+
+    rendered = snapshot.render()
+    assert "Walk Dog" in rendered
+    assert "Pay Rent" in rendered
+
+def test_snapshot_degrades_to_summary():
+    """Test that a large list is cut down to fit the token budget"""
+
+    snapshot = TodoSnapshot(token_budget=60)
+    for i in range(1, 101):
+        snapshot.upsert(i, f"Task number {i} with a fairly long title that gets cut")
+
+    rendered = snapshot.render()
+
+    assert "read_todos" in rendered
+    assert "ID 100:" in rendered # newest tasks are kept
+    assert "ID 1:" not in rendered
+    assert len(rendered) // 4 <= 60
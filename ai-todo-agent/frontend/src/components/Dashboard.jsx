@@ -5,7 +5,7 @@ import ChatInterface from "./ChatInterface";
 import { LogOut, ListTodo, MessageSquare, Sparkles } from "lucide-react";
 
 export default function Dashboard() {
-  const { token, logout, user } = useAuth();
+  const { token, logout, user, authFetch, refreshSession } = useAuth();
   const [todos, setTodos] = useState([]);
   const [chatHistory, setChatHistory] = useState([]);
   const [isAIProcessing, setIsAIProcessing] = useState(false);
@@ -36,6 +36,9 @@ export default function Dashboard() {
         } else if (data.type === "end") {
             setIsAIProcessing(false);
             fetchTodos();
+        } else if (data.type === "error" && data.content === "Session expired.") {
+            // Access token ran out: renew it. The new token re-runs this effect and reconnects.
+            refreshSession().then((newToken) => { if (!newToken) logout(); });
         } else if (data.type === "error") {
             setIsAIProcessing(false);
             setChatHistory((prev) => [...prev, { role: "ai", content: `Error: ${data.content}` }]);
@@ -49,9 +52,8 @@ export default function Dashboard() {
   // 2. Fetch Logic
   const fetchTodos = async () => {
     try {
-      const response = await fetch("http://127.0.0.1:8000/todos", {
-        headers: { Authorization: `Bearer ${token}` },
-      });
+      // authFetch renews the session on 401, so an expired access token doesn't break the list
+      const response = await authFetch("http://127.0.0.1:8000/todos");
       if (response.ok) {
         const data = await response.json();
         if (Array.isArray(data)) setTodos(data);
@@ -1,4 +1,4 @@
-import { createContext, useState, useEffect, useContext } from "react";
+import { createContext, useState, useEffect, useContext, useRef } from "react";
 
 const AuthContext = createContext();
 
@@ -6,6 +6,9 @@ export const AuthProvider = ({ children }) => {
   const [user, setUser] = useState(null);
   const [token, setToken] = useState(localStorage.getItem("token"));
   const [loading, setLoading] = useState(true);
+  // Only one refresh at a time: tokens rotate, so a second parallel refresh
+  // would re-use the old refresh token and revoke the whole session.
+  const refreshInFlight = useRef(null);
 
   useEffect(() => {
     const verifyUser = async () => {
@@ -20,7 +23,7 @@ export const AuthProvider = ({ children }) => {
         if (response.ok) {
           const userData = await response.json();
           setUser(userData);
-        } else {
+        } else if (!(await refreshSession())) {
           logout();
         }
       } catch (error) {
@@ -32,6 +35,53 @@ export const AuthProvider = ({ children }) => {
     verifyUser();
   }, [token]);
 
+  // Renew the session with the refresh token instead of asking for the password again.
+  // Resolves to the new access token, or null if the session can't be renewed.
+  const refreshSession = () => {
+    if (refreshInFlight.current) return refreshInFlight.current;
+
+    refreshInFlight.current = (async () => {
+      const refreshToken = localStorage.getItem("refresh_token");
+      if (!refreshToken) return null;
+
+      const response = await fetch("http://127.0.0.1:8000/token/refresh", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      });
+      if (!response.ok) return null;
+
+      const data = await response.json();
+      localStorage.setItem("token", data.access_token);
+      localStorage.setItem("refresh_token", data.refresh_token);
+      setToken(data.access_token);
+      return data.access_token;
+    })()
+      .catch(() => null)
+      .finally(() => { refreshInFlight.current = null; });
+
+    return refreshInFlight.current;
+  };
+
+  // fetch() with the access token. On a 401 (expired token) it renews the
+  // session once and retries, so open tabs keep working without a reload.
+  const authFetch = async (url, options = {}) => {
+    const withToken = (accessToken) => ({
+      ...options,
+      headers: { ...(options.headers || {}), Authorization: `Bearer ${accessToken}` },
+    });
+
+    const response = await fetch(url, withToken(localStorage.getItem("token")));
+    if (response.status !== 401) return response;
+
+    const newToken = await refreshSession();
+    if (!newToken) {
+      logout();
+      return response;
+    }
+    return fetch(url, withToken(newToken));
+  };
+
   const login = async (email, password) => {
     const formData = new FormData();
     formData.append("username", email);
@@ -50,6 +100,7 @@ export const AuthProvider = ({ children }) => {
     }
 
     localStorage.setItem("token", data.access_token);
+    localStorage.setItem("refresh_token", data.refresh_token);
     setToken(data.access_token);
     
     const userResponse = await fetch("http://127.0.0.1:8000/users/me", {
@@ -80,13 +131,22 @@ export const AuthProvider = ({ children }) => {
   };
 
   const logout = () => {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (refreshToken) {
+      fetch("http://127.0.0.1:8000/logout", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      }).catch(() => {});
+    }
+    localStorage.removeItem("refresh_token");
     localStorage.removeItem("token");
     setToken(null);
     setUser(null);
   };
 
   return (
-    <AuthContext.Provider value={{ user, token, login, register, logout, loading }}>
+    <AuthContext.Provider value={{ user, token, login, register, logout, loading, authFetch, refreshSession }}>
       {children}
     </AuthContext.Provider>
   );